@@ -10,9 +10,14 @@ KEYS_DIR = os.path.join(BASE_DIR, 'keys')
 PUBLIC_KEYS_DIR = os.path.join(KEYS_DIR, 'public')
 PRIVATE_KEYS_DIR = os.path.join(KEYS_DIR, 'private')
 MESSAGES_DIR = os.path.join(BASE_DIR, 'messages')
+BLOBS_DIR = os.path.join(MESSAGES_DIR, 'blobs')   # Zaszyfrowane treści adresowane hashem
+DEDUP_DIR = os.path.join(MESSAGES_DIR, 'dedup')   # Indeks kluczy wiadomości nadanych przez klienta
 
 
 USER_CONFIG_FILE = os.path.join(CONFIG_DIR, 'users.json')
 
 RSA_KEY_SIZE = 2048  # Rozmiar klucza RSA
-AES_KEY_SIZE = 256   # Rozmiar klucza AES
\ No newline at end of file
+AES_KEY_SIZE = 256   # Rozmiar klucza AES
+
+DEDUP_WINDOW = 300                  # Okno deduplikacji wiadomości (w sekundach)
+CONTENT_ADDRESSED_STORAGE = False   # Zapis zaszyfrowanych treści w BLOBS_DIR wg hasha SHA-256
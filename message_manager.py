@@ -6,38 +6,110 @@ import os
 import json
 import time
 import uuid
+import hashlib
 import config
 import crypto
 import user_manager
 
 
-def save_message(sender, recipient, encrypted_message, encrypted_key):
-    """Zapisuje zaszyfrowaną wiadomość."""
+def _dedup_index_path(sender, recipient, message_key):
+    """Zwraca ścieżkę wpisu indeksu deduplikacji dla klucza wiadomości klienta."""
+    key_hash = hashlib.sha256(f"{sender}\0{recipient}\0{message_key}".encode()).hexdigest()
+    return os.path.join(config.DEDUP_DIR, f"{key_hash}.json")
+
+
+def _find_duplicate(index_path):
+    """Zwraca ID wiadomości zapisanej pod tym samym kluczem w oknie deduplikacji."""
+    if not os.path.exists(index_path):
+        return None
+
+    with open(index_path, 'r') as f:
+        entry = json.load(f)
+
+    # Klucz wygasł - traktujemy wiadomość jako nową
+    if time.time() - entry['timestamp'] > config.DEDUP_WINDOW:
+        return None
+
+    message_path = os.path.join(config.MESSAGES_DIR, f"{entry['id']}.json")
+    if not os.path.exists(message_path):
+        return None
+
+    return entry['id']
+
+
+def _store_blob(encrypted_message):
+    """Zapisuje zaszyfrowaną treść pod jej hashem SHA-256 (tylko raz)."""
+    digest = hashlib.sha256(encrypted_message.encode()).hexdigest()
+    blob_path = os.path.join(config.BLOBS_DIR, f"{digest}.bin")
+
+    if not os.path.exists(blob_path):
+        with open(blob_path, 'w') as f:
+            f.write(encrypted_message)
+
+    return digest
+
+
+def _load_blob(digest):
+    """Wczytuje zaszyfrowaną treść zapisaną pod danym hashem."""
+    blob_path = os.path.join(config.BLOBS_DIR, f"{digest}.bin")
+    with open(blob_path, 'r') as f:
+        return f.read()
+
+
+def save_message(sender, recipient, encrypted_message, encrypted_key, message_key=None):
+    """
+    Zapisuje zaszyfrowaną wiadomość.
+    Jeśli podano klucz wiadomości (message_key), ponowne wysłanie z tym samym kluczem
+    w ciągu config.DEDUP_WINDOW sekund zwraca ID już zapisanej wiadomości.
+    """
+    # Sprawdzanie, czy wiadomość z tym kluczem nie została już zapisana
+    index_path = None
+    if message_key is not None:
+        index_path = _dedup_index_path(sender, recipient, message_key)
+        duplicate_id = _find_duplicate(index_path)
+        if duplicate_id:
+            print(f"Wiadomość o tym kluczu została już zapisana z ID: {duplicate_id}")
+            return duplicate_id
+
     # Tworzenie unikalnego ID wiadomości
     message_id = str(uuid.uuid4())
+    timestamp = time.time()
 
     # Przygotowanie danych wiadomości
     message_data = {
         'id': message_id,
         'sender': sender,
         'recipient': recipient,
-        'encrypted_message': encrypted_message,
         'encrypted_key': encrypted_key,
-        'timestamp': time.time(),
+        'timestamp': timestamp,
         'read': False
     }
 
+    # Zaszyfrowana treść trafia do pliku wiadomości albo do magazynu adresowanego hashem
+    if config.CONTENT_ADDRESSED_STORAGE:
+        message_data['blob'] = _store_blob(encrypted_message)
+    else:
+        message_data['encrypted_message'] = encrypted_message
+
     # Zapisywanie wiadomości do pliku
     message_file = os.path.join(config.MESSAGES_DIR, f"{message_id}.json")
     with open(message_file, 'w') as f:
         json.dump(message_data, f)
 
+    # Zapisywanie klucza wiadomości w indeksie deduplikacji
+    if index_path is not None:
+        with open(index_path, 'w') as f:
+            json.dump({'id': message_id, 'timestamp': timestamp}, f)
+
     print(f"Wiadomość została pomyślnie zapisana z ID: {message_id}")
     return message_id
 
 
-def send_message(sender, sender_private_key, recipient, message):
-    """Wysyła zaszyfrowaną wiadomość do odbiorcy."""
+def send_message(sender, sender_private_key, recipient, message, message_key=None):
+    """
+    Wysyła zaszyfrowaną wiadomość do odbiorcy.
+    Opcjonalny message_key pozwala bezpiecznie ponawiać wysyłkę bez tworzenia duplikatów.
+    """
     # Pobieranie klucza publicznego odbiorcy
     recipient_public_key = user_manager.get_user_public_key(recipient)
 
@@ -49,7 +121,7 @@ def send_message(sender, sender_private_key, recipient, message):
     encrypted_key, encrypted_message = crypto.encrypt_message(message, recipient_public_key)
 
     # Zapisywanie wiadomości
-    message_id = save_message(sender, recipient, encrypted_message, encrypted_key)
+    message_id = save_message(sender, recipient, encrypted_message, encrypted_key, message_key)
 
     if message_id:
         print(f"Wiadomość została pomyślnie wysłana do {recipient}.")
@@ -85,7 +157,10 @@ def get_messages_for_user(username):
 
 def read_message(message_data, private_key):
     """Odczytuje zaszyfrowaną wiadomość przy użyciu klucza prywatnego."""
-    encrypted_message = message_data['encrypted_message']
+    if 'blob' in message_data:
+        encrypted_message = _load_blob(message_data['blob'])
+    else:
+        encrypted_message = message_data['encrypted_message']
     encrypted_key = message_data['encrypted_key']
 
     # Odszyfrowywanie wiadomości
@@ -16,7 +16,8 @@ def initialize_config():
     # Upewnienie się, że katalogi istnieją
     for directory in [config.CONFIG_DIR, config.KEYS_DIR,
                       config.PUBLIC_KEYS_DIR, config.PRIVATE_KEYS_DIR,
-                      config.MESSAGES_DIR]:
+                      config.MESSAGES_DIR, config.BLOBS_DIR,
+                      config.DEDUP_DIR]:
         os.makedirs(directory, exist_ok=True)
 
     # Tworzenie pliku konfiguracyjnego użytkowników, jeśli nie istnieje